@@ -0,0 +1,57 @@
+import os
+import httpx
+import orjson
+from functools import cache
+from .docker_executor import _IS_WINDOWS
+
+DEFAULT_DOCKER_SOCKET = "/var/run/docker.sock"
+_daemon_session: httpx.AsyncClient | None = None
+
+
+def _current_docker_context() -> str:
+    context = os.environ.get("DOCKER_CONTEXT")
+    if context:
+        return context
+    config_dir = os.environ.get("DOCKER_CONFIG") or os.path.join(os.path.expanduser("~"), ".docker")
+    try:
+        with open(os.path.join(config_dir, "config.json"), "rb") as f:
+            return orjson.loads(f.read()).get("currentContext") or "default"
+    except (OSError, ValueError, AttributeError):
+        return "default"
+
+
+@cache
+def _docker_socket_path() -> str | None:
+    docker_host = os.environ.get("DOCKER_HOST", "")
+    if docker_host.startswith("unix://"):
+        return docker_host[len("unix://"):]
+    if docker_host or _IS_WINDOWS:
+        return None
+    # A non-default context (rootless, Docker Desktop, remote) may point at a
+    # different daemon; leave those to the CLI, which resolves contexts itself.
+    if _current_docker_context() != "default":
+        return None
+    return DEFAULT_DOCKER_SOCKET if os.path.exists(DEFAULT_DOCKER_SOCKET) else None
+
+
+def daemon_session() -> httpx.AsyncClient | None:
+    global _daemon_session
+    if _daemon_session is None:
+        socket_path = _docker_socket_path()
+        if socket_path is None:
+            return None
+        _daemon_session = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                uds=socket_path,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+            ),
+            base_url="http://docker"
+        )
+    return _daemon_session
+
+
+async def close_sessions() -> None:
+    global _daemon_session
+    if _daemon_session is not None:
+        await _daemon_session.aclose()
+        _daemon_session = None
@@ -1,102 +1,188 @@
-from typing import Tuple, Protocol, List
+from typing import Tuple, Protocol, Sequence, Dict
 import asyncio
 import os
-import platform
 import shutil
+import sys
 from abc import ABC, abstractmethod
+from collections import deque
+from functools import cache
+
+_IS_WINDOWS = sys.platform == 'win32'
 
 
 class CommandExecutor(Protocol):
-    async def execute(self, cmd: str | List[str]) -> Tuple[int, str, str]:
+    async def execute(self, cmd: Sequence[str], capture_stdout: bool = True,
+                      env: Dict[str, str] | None = None) -> Tuple[int, bytes, bytes]:
+        pass
+
+    async def execute_with_stdin(self, cmd: Sequence[str], stdin_bytes: bytes, capture_stdout: bool = True,
+                                 env: Dict[str, str] | None = None) -> Tuple[int, bytes, bytes]:
         pass
 
 
-class WindowsExecutor:
-    async def execute(self, cmd: str) -> Tuple[int, str, str]:
-        process = await asyncio.create_subprocess_shell(
-            cmd,
-            stdout=asyncio.subprocess.PIPE,
+class TailBuffer:
+    def __init__(self, maxlen_bytes: int = 65536):
+        self.maxlen_bytes = maxlen_bytes
+        self._chunks: deque[bytes] = deque()
+        self._size = 0
+
+    def append(self, chunk: bytes) -> None:
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        while self._size > self.maxlen_bytes:
+            head = self._chunks.popleft()
+            excess = self._size - self.maxlen_bytes
+            if len(head) > excess:
+                self._chunks.appendleft(head[excess:])
+                self._size -= excess
+            else:
+                self._size -= len(head)
+
+    def getvalue(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+class HeadTailBuffer:
+    TRUNCATED_MARKER = b"\n...[truncated]...\n"
+
+    def __init__(self, head_bytes: int = 32768, tail_bytes: int = 32768):
+        self.head_bytes = head_bytes
+        self._head = bytearray()
+        self._tail = TailBuffer(tail_bytes)
+        self._overflow = 0
+
+    def append(self, chunk: bytes) -> None:
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += chunk[:room]
+            chunk = chunk[room:]
+        if chunk:
+            self._overflow += len(chunk)
+            self._tail.append(chunk)
+
+    def getvalue(self) -> bytes:
+        marker = self.TRUNCATED_MARKER if self._overflow > self._tail.maxlen_bytes else b""
+        return bytes(self._head) + marker + self._tail.getvalue()
+
+
+async def _drain(stream: asyncio.StreamReader, buf: HeadTailBuffer) -> None:
+    while chunk := await stream.read(65536):
+        buf.append(chunk)
+
+
+async def _feed(stream: asyncio.StreamWriter, data: bytes) -> None:
+    try:
+        stream.write(data)
+        await stream.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+    finally:
+        stream.close()
+
+
+async def _collect(process: asyncio.subprocess.Process, stdin_bytes: bytes | None = None) -> Tuple[int, bytes, bytes]:
+    stdout, stderr = HeadTailBuffer(), HeadTailBuffer()
+    drains = [_drain(process.stderr, stderr)]
+    if process.stdout is not None:
+        drains.append(_drain(process.stdout, stdout))
+    if stdin_bytes is not None:
+        drains.append(_feed(process.stdin, stdin_bytes))
+    try:
+        await asyncio.gather(*drains)
+        await process.wait()
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            process.terminate()
+        raise
+    return process.returncode, stdout.getvalue(), stderr.getvalue()
+
+
+def _stdout_target(capture_stdout: bool) -> int:
+    return asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL
+
+
+class SubprocessExecutor:
+    async def execute(self, cmd: Sequence[str], capture_stdout: bool = True,
+                      env: Dict[str, str] | None = None) -> Tuple[int, bytes, bytes]:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=_stdout_target(capture_stdout),
             stderr=asyncio.subprocess.PIPE,
-            shell=True
+            env=env
         )
-        stdout, stderr = await process.communicate()
-        return process.returncode, stdout.decode(), stderr.decode()
+        return await _collect(process)
 
-
-class UnixExecutor:
-    async def execute(self, cmd: List[str]) -> Tuple[int, str, str]:
+    async def execute_with_stdin(self, cmd: Sequence[str], stdin_bytes: bytes, capture_stdout: bool = True,
+                                 env: Dict[str, str] | None = None) -> Tuple[int, bytes, bytes]:
         process = await asyncio.create_subprocess_exec(
             *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stdin=asyncio.subprocess.PIPE,
+            stdout=_stdout_target(capture_stdout),
+            stderr=asyncio.subprocess.PIPE,
+            env=env
         )
-        stdout, stderr = await process.communicate()
-        return process.returncode, stdout.decode(), stderr.decode()
+        return await _collect(process, stdin_bytes)
+
+
+@cache
+def _resolve_docker_cmd() -> str:
+    if _IS_WINDOWS:
+        docker_path = r"C:\Program Files\Docker\Docker\resources\bin\docker.exe"
+        if os.path.exists(docker_path):
+            return docker_path
+    else:
+        for docker_path in ("/usr/bin/docker", "/usr/local/bin/docker", "/opt/homebrew/bin/docker"):
+            if os.path.isfile(docker_path) and os.access(docker_path, os.X_OK):
+                return docker_path
+
+    docker_cmd = shutil.which('docker')
+    if not docker_cmd:
+        raise RuntimeError("Docker executable not found")
+    return docker_cmd
+
+
+_EXECUTOR = SubprocessExecutor()
 
 
 class DockerExecutorBase(ABC):
     def __init__(self):
-        self.docker_cmd = self._initialize_docker_cmd()
-        self.executor = WindowsExecutor() if platform.system() == 'Windows' else UnixExecutor()
+        self.docker_cmd = _resolve_docker_cmd()
+        self.executor = _EXECUTOR
 
     @abstractmethod
-    async def run_command(self, command: str, *args) -> Tuple[int, str, str]:
+    async def run_command(self, command: str, *args, capture_stdout: bool = True) -> Tuple[int, bytes, bytes]:
         pass
 
-    def _initialize_docker_cmd(self) -> str:
-        if platform.system() == 'Windows':
-            docker_dir = r"C:\Program Files\Docker\Docker\resources\bin"
-            docker_paths = [
-                os.path.join(docker_dir, "docker-compose.exe"),
-                os.path.join(docker_dir, "docker.exe")
-            ]
-            for path in docker_paths:
-                if os.path.exists(path):
-                    return path
 
-        docker_cmd = shutil.which('docker')
-        if not docker_cmd:
-            raise RuntimeError("Docker executable not found")
-        return docker_cmd
+class DockerCLIExecutor(DockerExecutorBase):
+    async def run_command(self, command: str, *args, capture_stdout: bool = True) -> Tuple[int, bytes, bytes]:
+        return await self.executor.execute((self.docker_cmd, command, *args), capture_stdout=capture_stdout)
 
 
 class DockerComposeExecutor(DockerExecutorBase):
-    def __init__(self, compose_file: str, project_name: str):
+    def __init__(self, compose_bytes: bytes, project_name: str):
         super().__init__()
-        self.compose_file = os.path.abspath(compose_file)
+        self.compose_bytes = compose_bytes
         self.project_name = project_name
+        self.env = {"DOCKER_BUILDKIT": "1", "COMPOSE_DOCKER_CLI_BUILD": "1", **os.environ}
+        self._cmd_prefix = (self.docker_cmd, "compose", "--ansi", "never", "-f", "-", "-p", self.project_name)
+
+    async def run_command(self, command: str, *args, capture_stdout: bool = True) -> Tuple[int, bytes, bytes]:
+        cmd = self._build_command(command, *args)
+        return await self.executor.execute_with_stdin(cmd, self.compose_bytes, capture_stdout=capture_stdout,
+                                                      env=self.env)
+
+    def _build_command(self, command: str, *args) -> Tuple[str, ...]:
+        return (*self._cmd_prefix, command, *args)
 
-    async def run_command(self, command: str, *args) -> Tuple[int, str, str]:
-        if platform.system() == 'Windows':
-            cmd = self._build_windows_command(command, *args)
-        else:
-            cmd = self._build_unix_command(command, *args)
-        return await self.executor.execute(cmd)
-
-    def _build_windows_command(self, command: str, *args) -> str:
-        compose_file = self.compose_file.replace('\\', '/')
-        return (f'cd "{os.path.dirname(compose_file)}" && docker compose '
-                f'-f "{os.path.basename(compose_file)}" '
-                f'-p {self.project_name} {command} {" ".join(args)}')
-
-    def _build_unix_command(self, command: str, *args) -> list[str]:
-        return [
-            self.docker_cmd,
-            "compose",
-            "-f", self.compose_file,
-            "-p", self.project_name,
-            command,
-            *args
-        ]
-
-    async def down(self) -> Tuple[int, str, str]:
+    async def down(self) -> Tuple[int, bytes, bytes]:
         return await self.run_command("down", "--volumes")
 
-    async def pull(self) -> Tuple[int, str, str]:
-        return await self.run_command("pull")
+    async def pull(self, *services: str) -> Tuple[int, bytes, bytes]:
+        return await self.run_command("pull", "--quiet", *services, capture_stdout=False)
 
-    async def up(self) -> Tuple[int, str, str]:
-        return await self.run_command("up", "-d")
+    async def up_full(self, pull_policy: str = "missing") -> Tuple[int, bytes, bytes]:
+        return await self.run_command("up", "-d", "--pull", pull_policy, "--remove-orphans", capture_stdout=False)
 
-    async def ps(self) -> Tuple[int, str, str]:
+    async def ps(self) -> Tuple[int, bytes, bytes]:
         return await self.run_command("ps")
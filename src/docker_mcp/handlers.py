@@ -1,32 +1,309 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import asyncio
+import functools
 import os
+import re
+import struct
+import time
 import yaml
-import platform
-from python_on_whales import DockerClient
-from mcp.types import TextContent, Tool, Prompt, PromptArgument, GetPromptResult, PromptMessage
-from .docker_executor import DockerComposeExecutor
-docker_client = DockerClient()
-
-
-async def parse_port_mapping(host_key: str, container_port: str | int) -> tuple[str, str] | tuple[str, str, str]:
-    if '/' in str(host_key):
-        host_port, protocol = host_key.split('/')
-        if protocol.lower() == 'udp':
-            return (str(host_port), str(container_port), 'udp')
-        return (str(host_port), str(container_port))
-
-    if isinstance(container_port, str) and '/' in container_port:
-        port, protocol = container_port.split('/')
-        if protocol.lower() == 'udp':
-            return (str(host_key), port, 'udp')
-        return (str(host_key), port)
-
-    return (str(host_key), str(container_port))
+import httpx
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from mcp.types import TextContent
+from .docker_executor import DockerCLIExecutor, DockerComposeExecutor
+from ._http import daemon_session
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+_DEBUG = os.environ.get("DOCKER_MCP_DEBUG") == "1"
+_MAX_DEBUG = 64 * 1024
+_DOCKER_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="docker-sdk")
+_IMAGE_CACHE_TTL = 30
+_image_exists_cache: Dict[str, float] = {}
+_image_locks: Dict[str, asyncio.Lock] = {}
+_image_lock_users: Dict[str, int] = {}
+
+
+class _DiscardList(list):
+    def append(self, item) -> None:
+        pass
+
+    def extend(self, items) -> None:
+        pass
+
+
+def _new_debug_info() -> List[str]:
+    return [] if _DEBUG else _DiscardList()
+
+
+def _debug_section(header: str, debug_info: List[str]) -> str:
+    if not debug_info:
+        return ""
+    debug_output = "\n".join(debug_info)
+    if len(debug_output) > _MAX_DEBUG:
+        debug_output = "...[truncated]\n" + debug_output[-_MAX_DEBUG:]
+    return f"\n\n{header}:\n{debug_output}"
+
+
+@functools.cache
+def _whales_client():
+    from python_on_whales import DockerClient
+    return DockerClient()
+
+
+async def _run_blocking(fn, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(
+        _DOCKER_POOL, functools.partial(fn, *args, **kwargs))
+
+
+async def _image_exists_fast(image: str) -> bool:
+    client = daemon_session()
+    if client is None:
+        return await _run_blocking(_whales_client().image.exists, image)
+    if ".." in image.split("/"):
+        raise ValueError(f"Invalid image reference: {image}")
+    response = await client.get(f"/images/{quote(image, safe='/:@')}/json")
+    return response.status_code == 200
+
+
+def _prune_image_cache(now: float) -> None:
+    # Entries are only added once the old one has expired, so the oldest come first
+    while _image_exists_cache:
+        image, checked_at = next(iter(_image_exists_cache.items()))
+        if now - checked_at < _IMAGE_CACHE_TTL:
+            break
+        del _image_exists_cache[image]
+
+
+async def _ensure_image(image: str) -> None:
+    lock = _image_locks.setdefault(image, asyncio.Lock())
+    _image_lock_users[image] = _image_lock_users.get(image, 0) + 1
+    try:
+        async with lock:
+            _prune_image_cache(time.monotonic())
+            if image in _image_exists_cache:
+                return
+            if not await _image_exists_fast(image):
+                await _pull_image(image)
+            _image_exists_cache[image] = time.monotonic()
+    finally:
+        _image_lock_users[image] -= 1
+        if not _image_lock_users[image]:
+            del _image_lock_users[image]
+            del _image_locks[image]
+
+
+def _split_image_ref(image: str) -> Tuple[str, str]:
+    name, sep, digest = image.partition('@')
+    if sep:
+        return name, digest
+    repository, sep, tag = name.rpartition(':')
+    if sep and '/' not in tag:
+        return repository, tag
+    return name, "latest"
+
+
+async def _pull_image(image: str) -> None:
+    client = daemon_session()
+    if client is not None:
+        try:
+            await _pull_image_via_daemon(client, image)
+            return
+        except RuntimeError:
+            # e.g. a private registry that needs the CLI's credential helpers
+            pass
+    await _run_blocking(_whales_client().image.pull, image)
+
+
+async def _pull_image_via_daemon(client: httpx.AsyncClient, image: str) -> None:
+    from_image, tag = _split_image_ref(image)
+    async with client.stream("POST", "/images/create", params={"fromImage": from_image, "tag": tag},
+                             timeout=None) as response:
+        if response.is_error:
+            await response.aread()
+            _check_daemon_response(response)
+        async for line in response.aiter_lines():
+            if line and (error := orjson.loads(line).get("error")):
+                raise RuntimeError(error)
+
+
+def _check_daemon_response(response: httpx.Response) -> None:
+    if response.is_error:
+        try:
+            message = orjson.loads(response.content).get("message", response.text)
+        except ValueError:
+            message = response.text
+        raise RuntimeError(f"Docker daemon returned {response.status_code}: {message}")
+
+
+_DURATION_UNITS = {"ns": 1, "us": 10**3, "ms": 10**6, "s": 10**9, "m": 60 * 10**9, "h": 3600 * 10**9}
+_MEMORY_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+def _parse_duration(value: str | int) -> int:
+    if isinstance(value, (int, float)):
+        return int(value * 10**9)
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ns|us|ms|s|m|h)", value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        raise ValueError(f"Invalid duration: {value}")
+    return int(sum(float(n) * _DURATION_UNITS[u] for n, u in parts))
+
+
+def _parse_memory(value: str | int) -> int:
+    if isinstance(value, int):
+        return value
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([bkmg]?)b?", value.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid memory limit: {value}")
+    return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2)])
+
+
+def _port_range(port: str) -> range:
+    start, _, end = port.partition('-')
+    return range(int(start), int(end or start) + 1)
+
+
+def _expand_port_range(host_port: str, container_port: str) -> List[Tuple[str, str]]:
+    if '-' not in container_port:
+        # The daemon picks a free port itself when HostPort is a range
+        return [(host_port, container_port)]
+    container_ports = _port_range(container_port)
+    if not host_port:
+        return [("", str(port)) for port in container_ports]
+    host_ports = _port_range(host_port)
+    if len(host_ports) != len(container_ports):
+        raise ValueError(f"Invalid port range mapping: {host_port}:{container_port}")
+    return [(str(host), str(container)) for host, container in zip(host_ports, container_ports)]
+
+
+def _build_container_config(image: str, environment: Dict[str, str], port_mappings: List[tuple],
+                            volume_mappings: List[tuple], network: str | None, healthcheck: Dict[str, Any] | None,
+                            restart_policy: str | None, cpus: float | None, memory: str | None) -> Dict[str, Any]:
+    exposed_ports = {}
+    port_bindings = {}
+    for host_port, container_port, *protocol in port_mappings:
+        host_ip, _, host_port = host_port.rpartition(':')
+        for host, container in _expand_port_range(host_port, container_port):
+            key = f"{container}/{protocol[0] if protocol else 'tcp'}"
+            exposed_ports[key] = {}
+            port_bindings.setdefault(key, []).append({"HostIp": host_ip, "HostPort": host})
+
+    host_config: Dict[str, Any] = {"PortBindings": port_bindings}
+    if volume_mappings:
+        host_config["Binds"] = [
+            f"{os.path.abspath(os.path.expanduser(host)) if host.startswith(('.', '~')) else host}:{container}"
+            for host, container in volume_mappings
+        ]
+    if network:
+        host_config["NetworkMode"] = network
+    if restart_policy:
+        name, _, retries = restart_policy.partition(':')
+        host_config["RestartPolicy"] = {"Name": name, "MaximumRetryCount": int(retries or 0)}
+    if cpus:
+        host_config["NanoCpus"] = int(float(cpus) * 10**9)
+    if memory:
+        host_config["Memory"] = _parse_memory(memory)
+
+    config: Dict[str, Any] = {
+        "Image": image,
+        "Env": [f"{key}={value}" for key, value in environment.items()],
+        "ExposedPorts": exposed_ports,
+        "HostConfig": host_config
+    }
+    if healthcheck:
+        test = healthcheck["test"]
+        config["Healthcheck"] = {"Test": ["CMD-SHELL", test] if isinstance(test, str) else test}
+        for key, field in (("interval", "Interval"), ("timeout", "Timeout"), ("start_period", "StartPeriod")):
+            if healthcheck.get(key):
+                config["Healthcheck"][field] = _parse_duration(healthcheck[key])
+        if healthcheck.get("retries") is not None:
+            config["Healthcheck"]["Retries"] = healthcheck["retries"]
+    return config
+
+
+async def _create_and_start(client: httpx.AsyncClient, name: str | None, config: Dict[str, Any]) -> Tuple[str, str]:
+    params = {"name": name} if name else None
+    response = await client.post(
+        "/containers/create", params=params, content=orjson.dumps(config),
+        headers={"Content-Type": "application/json"}, timeout=None
+    )
+    _check_daemon_response(response)
+    container_id = orjson.loads(response.content)["Id"]
+
+    response = await client.post(f"/containers/{container_id}/start", timeout=None)
+    _check_daemon_response(response)
+    if not name:
+        response = await client.get(f"/containers/{container_id}/json")
+        _check_daemon_response(response)
+        name = orjson.loads(response.content)["Name"].lstrip('/')
+    return name, container_id
+
+
+def _demux_logs(raw: bytes) -> str:
+    chunks = []
+    offset = 0
+    while offset + 8 <= len(raw):
+        _, length = struct.unpack_from('>BxxxI', raw, offset)
+        offset += 8
+        chunks.append(raw[offset:offset + length])
+        offset += length
+    return b"".join(chunks).decode(errors='replace')
+
+
+async def _fetch_logs(client: httpx.AsyncClient, container_name: str, tail: int) -> str:
+    response = await client.get(
+        f"/containers/{quote(container_name, safe='')}/logs",
+        params={"stdout": "1", "stderr": "1", "tail": str(tail)}
+    )
+    _check_daemon_response(response)
+    raw = response.content
+    # Daemons before API 1.42 label framed (non-TTY) output as raw-stream too,
+    # so look for a stream frame header rather than trusting the content type.
+    if raw[:1] in (b"\x00", b"\x01", b"\x02") and raw[1:4] == b"\x00\x00\x00":
+        return _demux_logs(raw)
+    return raw.decode(errors='replace')
+
+
+async def _list_containers_via_cli() -> str:
+    code, out, err = await DockerCLIExecutor().run_command(
+        "ps", "--all", "--format", "{{.ID}}\t{{.Names}}\t{{.State}}")
+    if code != 0:
+        raise RuntimeError(err.decode(errors='replace').strip())
+    rows = (line.split("\t") for line in out.decode(errors='replace').splitlines() if line)
+    return "\n".join(f"{container_id} - {name} - {state}" for container_id, name, state in rows)
+
+
+async def _fetch_logs_via_cli(container_name: str, tail: int) -> str:
+    code, out, err = await DockerCLIExecutor().run_command("logs", "--tail", str(tail), container_name)
+    if code != 0:
+        raise RuntimeError(err.decode(errors='replace').strip())
+    return (out + err).decode(errors='replace')
+
+
+def parse_port_mapping(host_key: str, container_port: str | int) -> tuple[str, str] | tuple[str, str, str]:
+    host_port = host_key if type(host_key) is str else str(host_key)
+    port = container_port if type(container_port) is str else str(container_port)
+
+    if '/' in host_port:
+        host_port, _, protocol = host_port.partition('/')
+    elif '/' in port:
+        port, _, protocol = port.partition('/')
+    else:
+        return (host_port, port)
+
+    if protocol.lower() == 'udp':
+        return (host_port, port, 'udp')
+    return (host_port, port)
 
 
 class DockerHandlers:
     TIMEOUT_AMOUNT = 200
+    ERROR_TAIL_BYTES = 4096
+    LOG_TAIL_LINES = 100
 
     @staticmethod
     async def handle_create_container(arguments: Dict[str, Any]) -> List[TextContent]:
@@ -46,21 +323,24 @@ class DockerHandlers:
             if not image:
                 raise ValueError("Image name cannot be empty")
 
-            port_mappings = []
-            for host_key, container_port in ports.items():
-                mapping = await parse_port_mapping(host_key, container_port)
-                port_mappings.append(mapping)
+            port_mappings = [parse_port_mapping(k, v) for k, v in ports.items()]
 
             volume_mappings = []
             for host_path, container_path in volumes.items():
                 volume_mappings.append((host_path, container_path))
 
             async def pull_and_run():
-                if not docker_client.image.exists(image):
-                    await asyncio.to_thread(docker_client.image.pull, image)
+                await _ensure_image(image)
 
-                container = await asyncio.to_thread(
-                    docker_client.container.run,
+                client = daemon_session()
+                if client is not None:
+                    config = _build_container_config(
+                        image, environment, port_mappings, volume_mappings,
+                        network, healthcheck, restart_policy, cpus, memory)
+                    return await _create_and_start(client, container_name, config)
+
+                container = await _run_blocking(
+                    _whales_client().container.run,
                     image,
                     name=container_name,
                     publish=port_mappings,
@@ -73,18 +353,19 @@ class DockerHandlers:
                     memory=memory,
                     detach=True
                 )
-                return container
+                return container.name, container.id
 
-            container = await asyncio.wait_for(pull_and_run(), timeout=DockerHandlers.TIMEOUT_AMOUNT)
-            return [TextContent(type="text", text=f"Created container '{container.name}' (ID: {container.id})")]
-        except asyncio.TimeoutError:
+            async with asyncio.timeout(DockerHandlers.TIMEOUT_AMOUNT):
+                name, container_id = await pull_and_run()
+            return [TextContent(type="text", text=f"Created container '{name}' (ID: {container_id})")]
+        except TimeoutError:
             return [TextContent(type="text", text=f"Operation timed out after {DockerHandlers.TIMEOUT_AMOUNT} seconds")]
         except Exception as e:
             return [TextContent(type="text", text=f"Error creating container: {str(e)} | Arguments: {arguments}")]
 
     @staticmethod
     async def handle_deploy_compose(arguments: Dict[str, Any]) -> List[TextContent]:
-        debug_info = []
+        debug_info = _new_debug_info()
         try:
             compose_yaml = arguments.get("compose_yaml")
             project_name = arguments.get("project_name")
@@ -95,20 +376,19 @@ class DockerHandlers:
 
             DockerHandlers._validate_project_name(project_name)
 
-            yaml_content = DockerHandlers._process_yaml(
-                compose_yaml, debug_info)
-            compose_path = DockerHandlers._save_compose_file(
-                yaml_content, project_name)
+            recreate = arguments.get("recreate", False)
+            if not isinstance(recreate, bool):
+                raise ValueError("recreate must be a boolean")
+
+            yaml_content = DockerHandlers._process_yaml(compose_yaml, debug_info)
+            images = DockerHandlers._compose_images(yaml_content)
 
-            try:
-                result = await DockerHandlers._deploy_stack(compose_path, project_name, debug_info)
-                return [TextContent(type="text", text=result)]
-            finally:
-                DockerHandlers._cleanup_files(compose_path)
+            result = await DockerHandlers._deploy_stack(
+                compose_yaml.encode('utf-8'), project_name, images, recreate, debug_info)
+            return [TextContent(type="text", text=result)]
 
         except Exception as e:
-            debug_output = "\n".join(debug_info)
-            return [TextContent(type="text", text=f"Error deploying compose stack: {str(e)}\n\nDebug Information:\n{debug_output}")]
+            return [TextContent(type="text", text=f"Error deploying compose stack: {str(e)}{_debug_section('Debug Information', debug_info)}")]
 
     @staticmethod
     def _process_yaml(compose_yaml: str, debug_info: List[str]) -> dict:
@@ -116,108 +396,139 @@ class DockerHandlers:
         debug_info.append(compose_yaml)
 
         try:
-            yaml_content = yaml.safe_load(compose_yaml)
-            debug_info.append("\n=== Loaded YAML Structure ===")
-            debug_info.append(str(yaml_content))
+            yaml_content = yaml.load(compose_yaml, Loader=_Loader)
+            if _DEBUG:
+                debug_info.append("\n=== Loaded YAML Structure ===")
+                debug_info.append(str(yaml_content))
             return yaml_content
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML format: {str(e)}")
 
     @staticmethod
-    def _validate_project_name(project_name: str) -> None:
-        import re
+    def _compose_images(yaml_content: Any) -> Dict[str, List[str]]:
+        services = yaml_content.get("services") if isinstance(yaml_content, dict) else None
+        if not isinstance(services, dict):
+            return {}
+        images: Dict[str, List[str]] = {}
+        for service_name, service in services.items():
+            if isinstance(service, dict) and not service.get("build") and isinstance(service.get("image"), str):
+                images.setdefault(service["image"], []).append(str(service_name))
+        return images
+
+    @staticmethod
+    async def _prepull_images(client: httpx.AsyncClient, images: List[str], debug_info: List[str]) -> List[str]:
+        pullable = [image for image in images if '$' not in image]
+        results = await asyncio.gather(
+            *(_pull_image_via_daemon(client, image) for image in pullable), return_exceptions=True)
+        failed = [image for image in images if '$' in image]
+        for image, result in zip(pullable, results):
+            if isinstance(result, Exception):
+                debug_info.append(f"Warning during pre-pull of {image}: {str(result)}")
+                failed.append(image)
+        return failed
 
+    @staticmethod
+    def _validate_project_name(project_name: str) -> None:
         if not re.fullmatch(r"[A-Za-z0-9_-]+", project_name):
             raise ValueError(
                 "project_name may only contain letters, numbers, hyphens, and underscores"
             )
 
     @staticmethod
-    def _save_compose_file(yaml_content: dict, project_name: str) -> str:
-        DockerHandlers._validate_project_name(project_name)
-        compose_dir = os.path.join(os.getcwd(), "docker_compose_files")
-        os.makedirs(compose_dir, exist_ok=True)
-
-        compose_yaml = yaml.safe_dump(
-            yaml_content, default_flow_style=False, sort_keys=False)
-        compose_path = os.path.join(
-            compose_dir, f"{project_name}-docker-compose.yml")
-
-        with open(compose_path, 'w', encoding='utf-8') as f:
-            f.write(compose_yaml)
-            f.flush()
-            if platform.system() != 'Windows':
-                os.fsync(f.fileno())
-
-        return compose_path
+    async def _deploy_stack(compose_bytes: bytes, project_name: str, images: Dict[str, List[str]], recreate: bool,
+                            debug_info: List[str]) -> str:
+        compose = DockerComposeExecutor(compose_bytes, project_name)
+        client = daemon_session()
+        prepull = None
+        if client is not None:
+            prepull = asyncio.create_task(DockerHandlers._prepull_images(client, list(images), debug_info))
 
-    @staticmethod
-    async def _deploy_stack(compose_path: str, project_name: str, debug_info: List[str]) -> str:
-        compose = DockerComposeExecutor(compose_path, project_name)
-
-        for command in [compose.down, compose.up]:
-            try:
-                code, out, err = await command()
-                debug_info.extend([
-                    f"\n=== {command.__name__.capitalize()} Command ===",
-                    f"Return Code: {code}",
-                    f"Stdout: {out}",
-                    f"Stderr: {err}"
-                ])
-
-                if code != 0 and command == compose.up:
-                    raise Exception(f"Deploy failed with code {code}: {err}")
-            except Exception as e:
-                if command != compose.down:
-                    raise e
-                debug_info.append(f"Warning during {
-                                  command.__name__}: {str(e)}")
+        try:
+            if recreate:
+                try:
+                    DockerHandlers._record_command("down", await compose.down(), debug_info)
+                except Exception as e:
+                    debug_info.append(f"Warning during down: {str(e)}")
+        except BaseException:
+            if prepull is not None:
+                prepull.cancel()
+            raise
+
+        if prepull is None:
+            # Nothing was pre-pulled without the daemon API, so let the single
+            # `up` refresh every image itself.
+            pull_policy = "always"
+        else:
+            failed = await prepull
+            # `up --pull missing` would keep stale tags for anything the daemon
+            # could not refresh, so let compose pull those services itself.
+            if failed:
+                services = [service for image in failed for service in images[image]]
+                DockerHandlers._record_command("pull", await compose.pull(*services), debug_info)
+            pull_policy = "missing"
+
+        code, out, err = await compose.up_full(pull_policy)
+        DockerHandlers._record_command("up", (code, out, err), debug_info)
+        if code != 0:
+            error_tail = err[-DockerHandlers.ERROR_TAIL_BYTES:].decode(errors='replace')
+            raise Exception(f"Deploy failed with code {code}: {error_tail}")
 
         code, out, err = await compose.ps()
-        service_info = out if code == 0 else "Unable to list services"
+        service_info = out.decode(errors='replace') if code == 0 else "Unable to list services"
 
-        return (f"Successfully deployed compose stack '{project_name}'\n"
-                f"Running services:\n{service_info}\n\n"
-                f"Debug Info:\n{chr(10).join(debug_info)}")
+        return "".join([
+            "Successfully deployed compose stack '", project_name, "'\nRunning services:\n", service_info
+        ])
 
     @staticmethod
-    def _cleanup_files(compose_path: str) -> None:
-        try:
-            if os.path.exists(compose_path):
-                os.remove(compose_path)
-            compose_dir = os.path.dirname(compose_path)
-            if os.path.exists(compose_dir) and not os.listdir(compose_dir):
-                os.rmdir(compose_dir)
-        except Exception as e:
-            print(f"Warning during cleanup: {str(e)}")
+    def _record_command(name: str, result: Tuple[int, bytes, bytes], debug_info: List[str]) -> None:
+        if not _DEBUG:
+            return
+        code, out, err = result
+        debug_info.extend([
+            f"\n=== {name.capitalize()} Command ===",
+            f"Return Code: {code}",
+            f"Stdout: {out.decode(errors='replace')}",
+            f"Stderr: {err.decode(errors='replace')}"
+        ])
 
     @staticmethod
     async def handle_get_logs(arguments: Dict[str, Any]) -> List[TextContent]:
-        debug_info = []
+        debug_info = _new_debug_info()
         try:
             container_name = arguments.get("container_name")
+            tail = arguments.get("tail", DockerHandlers.LOG_TAIL_LINES)
             if not container_name:
                 raise ValueError("Missing required container_name")
+            if type(tail) is not int or tail < 1:
+                raise ValueError("tail must be a positive integer")
 
             debug_info.append(f"Fetching logs for container '{
                               container_name}'")
-            logs = await asyncio.to_thread(docker_client.container.logs, container_name, tail=100)
+            client = daemon_session()
+            if client is None:
+                logs = await _fetch_logs_via_cli(container_name, tail)
+            else:
+                logs = await _fetch_logs(client, container_name, tail)
 
-            return [TextContent(type="text", text=f"Logs for container '{container_name}':\n{logs}\n\nDebug Info:\n{chr(10).join(debug_info)}")]
+            return [TextContent(type="text", text=f"Logs for container '{container_name}':\n{logs}")]
         except Exception as e:
-            debug_output = "\n".join(debug_info)
-            return [TextContent(type="text", text=f"Error retrieving logs: {str(e)}\n\nDebug Information:\n{debug_output}")]
+            return [TextContent(type="text", text=f"Error retrieving logs: {str(e)}{_debug_section('Debug Information', debug_info)}")]
 
     @staticmethod
     async def handle_list_containers(arguments: Dict[str, Any]) -> List[TextContent]:
-        debug_info = []
+        debug_info = _new_debug_info()
         try:
             debug_info.append("Listing all Docker containers")
-            containers = await asyncio.to_thread(docker_client.container.list, all=True)
-            container_list = "\n".join(
-                [f"{c.id[:12]} - {c.name} - {c.state.status}" for c in containers])
-
-            return [TextContent(type="text", text=f"All Docker Containers:\n{container_list}\n\nDebug Info:\n{chr(10).join(debug_info)}")]
+            client = daemon_session()
+            if client is None:
+                container_list = await _list_containers_via_cli()
+            else:
+                response = await client.get("/containers/json", params={"all": "1"})
+                _check_daemon_response(response)
+                container_list = "\n".join(
+                    f"{c['Id'][:12]} - {c['Names'][0][1:]} - {c['State']}" for c in orjson.loads(response.content))
+
+            return [TextContent(type="text", text=f"All Docker Containers:\n{container_list}")]
         except Exception as e:
-            debug_output = "\n".join(debug_info)
-            return [TextContent(type="text", text=f"Error listing containers: {str(e)}\n\nDebug Information:\n{debug_output}")]
+            return [TextContent(type="text", text=f"Error listing containers: {str(e)}{_debug_section('Debug Information', debug_info)}")]
@@ -1,4 +1,5 @@
 import asyncio
+import os
 import signal
 import sys
 from typing import List, Dict, Any
@@ -7,52 +8,44 @@ from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 import mcp.server.stdio
 from .handlers import DockerHandlers
+from ._http import close_sessions
 
 server = Server("docker-mcp")
+SHUTDOWN_GRACE_PERIOD = 1
 
 
-@server.list_prompts()
-async def handle_list_prompts() -> List[types.Prompt]:
-    return [
-        types.Prompt(
-            name="deploy-stack",
-            description="Generate and deploy a Docker stack based on requirements",
-            arguments=[
-                types.PromptArgument(
-                    name="requirements",
-                    description="Description of the desired Docker stack",
-                    required=True
-                ),
-                types.PromptArgument(
-                    name="project_name",
-                    description="Name for the Docker Compose project",
-                    required=True
-                )
-            ]
-        )
-    ]
-
-
-@server.get_prompt()
-async def handle_get_prompt(name: str, arguments: Dict[str, str] | None) -> types.GetPromptResult:
-    if name != "deploy-stack":
-        raise ValueError(f"Unknown prompt: {name}")
+_PROMPTS: List[types.Prompt] = [
+    types.Prompt(
+        name="deploy-stack",
+        description="Generate and deploy a Docker stack based on requirements",
+        arguments=[
+            types.PromptArgument(
+                name="requirements",
+                description="Description of the desired Docker stack",
+                required=True
+            ),
+            types.PromptArgument(
+                name="project_name",
+                description="Name for the Docker Compose project",
+                required=True
+            )
+        ]
+    )
+]
 
-    if not arguments or "requirements" not in arguments or "project_name" not in arguments:
-        raise ValueError("Missing required arguments")
 
-    system_message = (
-        "You are a Docker deployment specialist. Generate appropriate Docker Compose YAML or "
-        "container configurations based on user requirements. For simple single-container "
-        "deployments, use the create-container tool. For multi-container deployments, generate "
-        "a docker-compose.yml and use the deploy-compose tool. To access logs, first use the "
-        "list-containers tool to discover running containers, then use the get-logs tool to "
-        "retrieve logs for a specific container."
-    )
+_SYSTEM_MESSAGE = (
+    "You are a Docker deployment specialist. Generate appropriate Docker Compose YAML or "
+    "container configurations based on user requirements. For simple single-container "
+    "deployments, use the create-container tool. For multi-container deployments, generate "
+    "a docker-compose.yml and use the deploy-compose tool. To access logs, first use the "
+    "list-containers tool to discover running containers, then use the get-logs tool to "
+    "retrieve logs for a specific container."
+)
 
-    user_message = f"""Please help me deploy the following stack:
-Requirements: {arguments['requirements']}
-Project name: {arguments['project_name']}
+_USER_MESSAGE_TEMPLATE = """Please help me deploy the following stack:
+Requirements: {requirements}
+Project name: {project_name}
 
 Analyze if this needs a single container or multiple containers. Then:
 1. For single container: Use the create-container tool with format:
@@ -69,6 +62,23 @@ Analyze if this needs a single container or multiple containers. Then:
     "compose_yaml": "version: '3.8'\\nservices:\\n  service1:\\n    image: image1:latest\\n    ports:\\n      - '8080:80'"
 }}"""
 
+
+@server.list_prompts()
+async def handle_list_prompts() -> List[types.Prompt]:
+    return _PROMPTS
+
+
+@server.get_prompt()
+async def handle_get_prompt(name: str, arguments: Dict[str, str] | None) -> types.GetPromptResult:
+    if name != "deploy-stack":
+        raise ValueError(f"Unknown prompt: {name}")
+
+    if not arguments or "requirements" not in arguments or "project_name" not in arguments:
+        raise ValueError("Missing required arguments")
+
+    user_message = _USER_MESSAGE_TEMPLATE.format(
+        requirements=arguments['requirements'], project_name=arguments['project_name'])
+
     return types.GetPromptResult(
         description="Generate and deploy a Docker stack",
         messages=[
@@ -76,7 +86,7 @@ Analyze if this needs a single container or multiple containers. Then:
                 role="system",
                 content=types.TextContent(
                     type="text",
-                    text=system_message
+                    text=_SYSTEM_MESSAGE
                 )
             ),
             types.PromptMessage(
@@ -90,85 +100,90 @@ Analyze if this needs a single container or multiple containers. Then:
     )
 
 
-@server.list_tools()
-async def handle_list_tools() -> List[types.Tool]:
-    return [
-        types.Tool(
-            name="create-container",
-            description="Create a new standalone Docker container",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "image": {"type": "string"},
-                    "name": {"type": "string"},
-                    "ports": {
-                        "type": "object",
-                        "additionalProperties": {"type": "string"}
-                    },
-                    "environment": {
-                        "type": "object",
-                        "additionalProperties": {"type": "string"}
-                    },
-                    "volumes": {
-                        "type": "object",
-                        "additionalProperties": {"type": "string"}
-                    },
-                    "network": {"type": "string"},
-                    "healthcheck": {
-                        "type": "object",
-                        "properties": {
-                            "test": {"type": ["string", "array"]},
-                            "interval": {"type": "string"},
-                            "timeout": {"type": "string"},
-                            "retries": {"type": "integer"},
-                            "start_period": {"type": "string"}
-                        },
-                        "required": ["test"]
-                    },
-                    "restart_policy": {"type": "string"},
-                    "resources": {
-                        "type": "object",
-                        "properties": {
-                            "cpus": {"type": "number"},
-                            "memory": {"type": "string"}
-                        }
-                    }
+_TOOLS: List[types.Tool] = [
+    types.Tool(
+        name="create-container",
+        description="Create a new standalone Docker container",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "image": {"type": "string"},
+                "name": {"type": "string"},
+                "ports": {
+                    "type": "object",
+                    "additionalProperties": {"type": "string"}
                 },
-                "required": ["image"]
-            }
-        ),
-        types.Tool(
-            name="deploy-compose",
-            description="Deploy a Docker Compose stack",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "compose_yaml": {"type": "string"},
-                    "project_name": {"type": "string"}
+                "environment": {
+                    "type": "object",
+                    "additionalProperties": {"type": "string"}
                 },
-                "required": ["compose_yaml", "project_name"]
-            }
-        ),
-        types.Tool(
-            name="get-logs",
-            description="Retrieve the latest logs for a specified Docker container",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "container_name": {"type": "string"}
+                "volumes": {
+                    "type": "object",
+                    "additionalProperties": {"type": "string"}
                 },
-                "required": ["container_name"]
-            }
-        ),
-        types.Tool(
-            name="list-containers",
-            description="List all Docker containers",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        )
-    ]
+                "network": {"type": "string"},
+                "healthcheck": {
+                    "type": "object",
+                    "properties": {
+                        "test": {"type": ["string", "array"]},
+                        "interval": {"type": "string"},
+                        "timeout": {"type": "string"},
+                        "retries": {"type": "integer"},
+                        "start_period": {"type": "string"}
+                    },
+                    "required": ["test"]
+                },
+                "restart_policy": {"type": "string"},
+                "resources": {
+                    "type": "object",
+                    "properties": {
+                        "cpus": {"type": "number"},
+                        "memory": {"type": "string"}
+                    }
+                }
+            },
+            "required": ["image"]
+        }
+    ),
+    types.Tool(
+        name="deploy-compose",
+        description="Deploy a Docker Compose stack",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "compose_yaml": {"type": "string"},
+                "project_name": {"type": "string"},
+                "recreate": {"type": "boolean"}
+            },
+            "required": ["compose_yaml", "project_name"]
+        }
+    ),
+    types.Tool(
+        name="get-logs",
+        description="Retrieve the latest logs for a specified Docker container",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "container_name": {"type": "string"},
+                "tail": {"type": "integer", "minimum": 1}
+            },
+            "required": ["container_name"]
+        }
+    ),
+    types.Tool(
+        name="list-containers",
+        description="List all Docker containers",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    )
+]
+
+
+@server.list_tools()
+async def handle_list_tools() -> List[types.Tool]:
+    return _TOOLS
 
 
 @server.call_tool()
@@ -191,10 +206,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any] | None) -> List[
         return [types.TextContent(type="text", text=f"Error: {str(e)} | Arguments: {arguments}")]
 
 
-async def main():
-    signal.signal(signal.SIGINT, handle_shutdown)
-    signal.signal(signal.SIGTERM, handle_shutdown)
-
+async def _serve():
     async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
@@ -210,10 +222,62 @@ async def main():
         )
 
 
+async def main():
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    loop_signals = []
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+            loop_signals.append(sig)
+        except NotImplementedError:
+            signal.signal(sig, handle_shutdown)
+
+    server_task = asyncio.create_task(_serve())
+    stop_task = asyncio.create_task(stop.wait())
+    try:
+        done, _ = await asyncio.wait({server_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+
+        if stop_task in done:
+            print("Shutting down gracefully...", file=sys.stderr)
+            server_task.cancel()
+            # The stdin reader thread cannot be interrupted, so let in-flight
+            # handlers unwind and then return without waiting for it.
+            await asyncio.wait({server_task}, timeout=SHUTDOWN_GRACE_PERIOD)
+            return
+
+        stop_task.cancel()
+        server_task.result()
+    finally:
+        for sig in loop_signals:
+            loop.remove_signal_handler(sig)
+        await close_sessions()
+
+
+def run_stdio():
+    async def run_and_exit():
+        await main()
+        # main() may return while the stdin reader thread is still blocked,
+        # so leave without letting interpreter shutdown wait on it.
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(0)
+
+    asyncio.run(run_and_exit(), loop_factory=event_loop_factory())
+
+
+def event_loop_factory():
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 def handle_shutdown(signum, frame):
-    print("Shutting down gracefully...")
+    print("Shutting down gracefully...", file=sys.stderr)
     sys.exit(0)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_stdio()
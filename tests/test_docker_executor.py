@@ -0,0 +1,35 @@
+from docker_mcp.docker_executor import HeadTailBuffer, TailBuffer
+
+
+def test_tail_buffer_keeps_the_last_bytes():
+    buf = TailBuffer(maxlen_bytes=5)
+    for chunk in (b"abc", b"defg", b"h"):
+        buf.append(chunk)
+    assert buf.getvalue() == b"defgh"
+
+
+def test_tail_buffer_trims_a_partially_evicted_chunk():
+    buf = TailBuffer(maxlen_bytes=4)
+    buf.append(b"abcdef")
+    assert buf.getvalue() == b"cdef"
+
+
+def test_head_tail_buffer_splits_a_chunk_across_the_head_boundary():
+    buf = HeadTailBuffer(head_bytes=4, tail_bytes=4)
+    buf.append(b"ab")
+    buf.append(b"cdef")
+    assert buf.getvalue() == b"abcdef"
+
+
+def test_head_tail_buffer_has_no_marker_when_the_tail_is_exactly_full():
+    buf = HeadTailBuffer(head_bytes=4, tail_bytes=4)
+    buf.append(b"abcd")
+    buf.append(b"efgh")
+    assert buf.getvalue() == b"abcdefgh"
+
+
+def test_head_tail_buffer_marks_dropped_output():
+    buf = HeadTailBuffer(head_bytes=4, tail_bytes=4)
+    buf.append(b"abcdefghi")
+    buf.append(b"jk")
+    assert buf.getvalue() == b"abcd" + HeadTailBuffer.TRUNCATED_MARKER + b"hijk"
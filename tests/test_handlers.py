@@ -0,0 +1,175 @@
+import asyncio
+import struct
+import time
+
+import httpx
+import pytest
+
+from docker_mcp import handlers
+from docker_mcp.handlers import (
+    _build_container_config,
+    _demux_logs,
+    _ensure_image,
+    _expand_port_range,
+    _fetch_logs,
+    _parse_duration,
+    _parse_memory,
+    _split_image_ref,
+    parse_port_mapping,
+)
+
+
+def _frame(stream: int, payload: bytes) -> bytes:
+    return struct.pack('>BxxxI', stream, len(payload)) + payload
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("30s", 30 * 10**9),
+    ("1m30s", 90 * 10**9),
+    ("500ms", 500 * 10**6),
+    ("1.5h", 5400 * 10**9),
+    (10, 10 * 10**9),
+])
+def test_parse_duration(value, expected):
+    assert _parse_duration(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "30", "30x", "1m 30s"])
+def test_parse_duration_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        _parse_duration(value)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("512m", 512 * 1024**2),
+    ("1g", 1024**3),
+    ("2GB", 2 * 1024**3),
+    ("100", 100),
+    (4096, 4096),
+])
+def test_parse_memory(value, expected):
+    assert _parse_memory(value) == expected
+
+
+def test_parse_memory_rejects_invalid():
+    with pytest.raises(ValueError):
+        _parse_memory("lots")
+
+
+@pytest.mark.parametrize("image, expected", [
+    ("nginx", ("nginx", "latest")),
+    ("nginx:1.27", ("nginx", "1.27")),
+    ("localhost:5000/app", ("localhost:5000/app", "latest")),
+    ("localhost:5000/app:v2", ("localhost:5000/app", "v2")),
+    ("nginx@sha256:abc", ("nginx", "sha256:abc")),
+])
+def test_split_image_ref(image, expected):
+    assert _split_image_ref(image) == expected
+
+
+def test_demux_logs_joins_stdout_and_stderr_frames():
+    raw = _frame(1, b"hello\n") + _frame(2, b"oops\n")
+    assert _demux_logs(raw) == "hello\noops\n"
+
+
+def test_fetch_logs_escapes_the_container_name():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.raw_path)
+        return httpx.Response(200, content=_frame(1, b"hi\n"))
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://docker")
+    assert asyncio.run(_fetch_logs(client, "../images/present/json?x=", 5)) == "hi\n"
+    assert paths[0].startswith(b"/containers/..%2Fimages%2Fpresent%2Fjson%3Fx%3D/logs?")
+
+
+def test_demux_logs_ignores_truncated_trailing_header():
+    assert _demux_logs(_frame(1, b"ok\n") + b"\x01\x00") == "ok\n"
+
+
+@pytest.mark.parametrize("host, container, expected", [
+    ("8080", "80", ("8080", "80")),
+    ("8080/udp", "53", ("8080", "53", "udp")),
+    (8080, "53/udp", ("8080", "53", "udp")),
+    ("8080/tcp", 80, ("8080", "80")),
+])
+def test_parse_port_mapping(host, container, expected):
+    assert parse_port_mapping(host, container) == expected
+
+
+def test_expand_port_range_pairs_host_and_container_ports():
+    assert _expand_port_range("8000-8001", "9000-9001") == [("8000", "9000"), ("8001", "9001")]
+    assert _expand_port_range("", "9000-9001") == [("", "9000"), ("", "9001")]
+    assert _expand_port_range("5000-5010", "80") == [("5000-5010", "80")]
+
+
+def test_expand_port_range_rejects_mismatched_lengths():
+    with pytest.raises(ValueError):
+        _expand_port_range("8000", "9000-9001")
+
+
+def test_build_container_config():
+    config = _build_container_config(
+        "nginx", {"A": "1"}, [("127.0.0.1:8000-8001", "80-81", "udp")], [("/data", "/srv")],
+        "mynet", {"test": "curl -f http://localhost", "interval": "30s", "retries": 3},
+        "on-failure:5", 1.5, "512m")
+
+    assert config["Env"] == ["A=1"]
+    assert config["ExposedPorts"] == {"80/udp": {}, "81/udp": {}}
+    host_config = config["HostConfig"]
+    assert host_config["PortBindings"] == {
+        "80/udp": [{"HostIp": "127.0.0.1", "HostPort": "8000"}],
+        "81/udp": [{"HostIp": "127.0.0.1", "HostPort": "8001"}],
+    }
+    assert host_config["Binds"] == ["/data:/srv"]
+    assert host_config["NetworkMode"] == "mynet"
+    assert host_config["RestartPolicy"] == {"Name": "on-failure", "MaximumRetryCount": 5}
+    assert host_config["NanoCpus"] == 1_500_000_000
+    assert host_config["Memory"] == 512 * 1024**2
+    assert config["Healthcheck"] == {
+        "Test": ["CMD-SHELL", "curl -f http://localhost"],
+        "Interval": 30 * 10**9,
+        "Retries": 3,
+    }
+
+
+@pytest.fixture
+def image_checks(monkeypatch):
+    checks = []
+
+    async def image_exists(image):
+        checks.append(image)
+        await asyncio.sleep(0.01)
+        return True
+
+    async def pull_image(image):
+        raise AssertionError(f"unexpected pull of {image}")
+
+    monkeypatch.setattr(handlers, "_image_exists_fast", image_exists)
+    monkeypatch.setattr(handlers, "_pull_image", pull_image)
+    monkeypatch.setattr(handlers, "_image_exists_cache", {})
+    monkeypatch.setattr(handlers, "_image_locks", {})
+    monkeypatch.setattr(handlers, "_image_lock_users", {})
+    return checks
+
+
+def test_ensure_image_dedupes_concurrent_checks_and_releases_locks(image_checks):
+    async def ensure_many():
+        await asyncio.gather(*(_ensure_image("nginx") for _ in range(5)), _ensure_image("redis"))
+        await _ensure_image("nginx")
+
+    asyncio.run(ensure_many())
+    assert sorted(image_checks) == ["nginx", "redis"]
+    assert handlers._image_locks == {}
+    assert handlers._image_lock_users == {}
+
+
+def test_ensure_image_prunes_expired_entries(image_checks):
+    handlers._image_exists_cache["nginx"] = time.monotonic() - handlers._IMAGE_CACHE_TTL - 1
+
+    asyncio.run(_ensure_image("redis"))
+    assert list(handlers._image_exists_cache) == ["redis"]
+
+    asyncio.run(_ensure_image("nginx"))
+    assert image_checks == ["redis", "nginx"]
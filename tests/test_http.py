@@ -0,0 +1,49 @@
+import pytest
+
+from docker_mcp import _http
+
+
+@pytest.fixture
+def docker_env(monkeypatch, tmp_path):
+    socket = tmp_path / "docker.sock"
+    socket.touch()
+    monkeypatch.setattr(_http, "DEFAULT_DOCKER_SOCKET", str(socket))
+    monkeypatch.setattr(_http, "_IS_WINDOWS", False)
+    for name in ("DOCKER_HOST", "DOCKER_CONTEXT"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("DOCKER_CONFIG", str(tmp_path))
+    _http._docker_socket_path.cache_clear()
+    yield tmp_path
+    _http._docker_socket_path.cache_clear()
+
+
+def test_default_socket_is_used_without_a_context(docker_env):
+    assert _http._docker_socket_path() == str(docker_env / "docker.sock")
+
+
+def test_unix_docker_host_wins(docker_env, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", "unix:///run/user/1000/docker.sock")
+    monkeypatch.setenv("DOCKER_CONTEXT", "rootless")
+    assert _http._docker_socket_path() == "/run/user/1000/docker.sock"
+
+
+def test_tcp_docker_host_uses_the_cli(docker_env, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", "tcp://127.0.0.1:2375")
+    assert _http._docker_socket_path() is None
+
+
+def test_non_default_context_env_uses_the_cli(docker_env, monkeypatch):
+    monkeypatch.setenv("DOCKER_CONTEXT", "rootless")
+    assert _http._docker_socket_path() is None
+
+
+def test_non_default_current_context_uses_the_cli(docker_env):
+    (docker_env / "config.json").write_text('{"currentContext": "desktop-linux"}')
+    assert _http._docker_socket_path() is None
+
+
+@pytest.mark.parametrize("config", ["{not json", "[]", '{"currentContext": ""}'])
+def test_malformed_config_falls_back_to_default(docker_env, config):
+    (docker_env / "config.json").write_text(config)
+    assert _http._current_docker_context() == "default"
+    assert _http._docker_socket_path() == str(docker_env / "docker.sock")